@@ -2649,24 +2649,20 @@ class TestStream:
     def test_read_check_compression(self):
         """
         Test to ensure calling read with check_compression=False does not
-        call expensive tar or zip functions.
-        """
-        with mock.patch("tarfile.is_tarfile") as tar_p:
-            with mock.patch("zipfile.is_zipfile") as zip_p:
-                read('/path/to/slist.ascii', format='SLIST',
-                     check_compression=False)
-
-        # assert neither compression check function was called.
-        assert tar_p.call_count == 0
-        assert zip_p.call_count == 0
-
-        # ensure compression checks get called when check_compression is True
-        with mock.patch("tarfile.is_tarfile", return_value=0) as tar_p:
-            with mock.patch("zipfile.is_zipfile", return_value=0) as zip_p:
-                read('/path/to/slist.ascii', format='SLIST',
-                     check_compression=True)
-        assert tar_p.call_count == 1
-        assert zip_p.call_count >= 1
+        check for compression of the file.
+        """
+        sniff = "obspy.core.util.decorator._sniff_compression"
+        with mock.patch(sniff) as sniff_p:
+            read('/path/to/slist.ascii', format='SLIST',
+                 check_compression=False)
+        # assert compression check function was not called.
+        assert sniff_p.call_count == 0
+
+        # ensure compression check gets called when check_compression is True
+        with mock.patch(sniff, return_value=None) as sniff_p:
+            read('/path/to/slist.ascii', format='SLIST',
+                 check_compression=True)
+        assert sniff_p.call_count == 1
 
     def test_rotate_to_zne(self):
         """
@@ -1863,6 +1863,17 @@ class TestTrace:
         assert "taper" in pr[9]
         assert "normalize" in pr[10]
 
+    def test_processing_information_stacked_decorators(self):
+        """
+        Test processing information for methods that have other decorators
+        below @_add_processing_info, e.g. filter() with @raise_if_masked.
+        """
+        tr = read()[0]
+        tr.filter("lowpass", freq=2.0)
+        assert tr.stats.processing == [
+            "ObsPy %s: filter(options={'freq': 2.0}::type='lowpass')" %
+            __version__]
+
     def test_no_processing_info_for_failed_operations(self):
         """
         If an operation fails, no processing information should be attached
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import warnings
+
+import pytest
+
 from obspy.core.util import get_example_file
-from obspy.core.util.decorator import map_example_filename
+from obspy.core.util.decorator import deprecated, map_example_filename
+from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 
 
 class TestUtilDecorator:
@@ -48,3 +53,26 @@ class TestUtilDecorator:
         assert changed3(path, b=dummy) == unchanged(path, dummy)
         assert changed3(path, b=path, x=path) == \
             unchanged(path, path, x=path_mapped)
+
+    def test_deprecated(self):
+        """
+        Tests the @deprecated decorator only warns on first call by default
+        """
+        @deprecated()
+        def once():
+            return 1
+
+        @deprecated("use something else", always=True)
+        def always():
+            return 2
+
+        with pytest.warns(ObsPyDeprecationWarning,
+                          match="deprecated function once"):
+            assert once() == 1
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert once() == 1
+        for _ in range(2):
+            with pytest.warns(ObsPyDeprecationWarning,
+                              match="use something else"):
+                assert always() == 2
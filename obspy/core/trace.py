@@ -262,7 +262,11 @@ def _add_processing_info(func, *args, **kwargs):
     This is a decorator that attaches information about a processing call as a
     string to the Trace.stats.processing list.
     """
-    callargs = inspect.getcallargs(func, *args, **kwargs)
+    # resolve the signature of the undecorated function, getcallargs() does
+    # not follow functools.wraps wrappers of other decorators
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    callargs = dict(bound.arguments)
     callargs.pop("self")
     kwargs_ = callargs.pop("kwargs", {})
     from obspy import __version__
@@ -8,10 +8,13 @@ Decorator used in ObsPy.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+from concurrent.futures import ThreadPoolExecutor
+import errno
 import functools
+import importlib
 import inspect
 from pathlib import Path
-import re
+import shutil
 import socket
 import tarfile
 import warnings
@@ -19,14 +22,29 @@ import zipfile
 
 import numpy as np
 import pytest
-from decorator import decorator
 
 from obspy.core.util import get_example_file
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 
 
-def deprecated(warning_msg=None):
+# chunk size used when writing uncompressed data to temporary files
+_COPY_CHUNK_SIZE = 1 << 16
+
+# messages used by deprecated_keywords()
+_MSG_DEPRECATED_KEYWORD = (
+    "Deprecated keyword %s in %s() call - please use %s instead.")
+_MSG_IGNORED_KEYWORD = "Deprecated keyword %s in %s() call - ignoring."
+_MSG_CONFLICTING_KEYWORDS = (
+    "Conflicting deprecated keywords (%s) in %s() call"
+    " - please use new '%s' keyword instead.")
+
+# cached lookup of example file paths for map_example_filename(), lookups of
+# missing files raise and thus are not cached
+_cached_example_file = functools.lru_cache(maxsize=256)(get_example_file)
+
+
+def deprecated(warning_msg=None, always=False):
     """
     This is a decorator which can be used to mark functions as deprecated.
 
@@ -35,19 +53,33 @@ def deprecated(warning_msg=None):
         returning the correct decorator for the specified options. It can be
         used just like a decorator.
 
-    It will result in a warning being emitted when the function is used.
+    It will result in a warning being emitted when the function is used for
+    the first time.
+
+    :type warning_msg: str
+    :param warning_msg: Custom warning message.
+    :type always: bool
+    :param always: Emit the warning on every call of the function, not only
+        on the first one.
     """
-    @decorator
-    def _deprecated(func, *args, **kwargs):
-        if 'deprecated' in str(func.__doc__).lower():
-            msg = func.__doc__
-        elif warning_msg:
-            msg = warning_msg
-            func.__doc__ = warning_msg
-        else:
-            msg = "Call to deprecated function %s." % func.__name__
-        warnings.warn(msg, category=ObsPyDeprecationWarning, stacklevel=3)
-        return func(*args, **kwargs)
+    def _deprecated(func):
+        emitted = [False]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if always or not emitted[0]:
+                if 'deprecated' in str(func.__doc__).lower():
+                    msg = func.__doc__
+                elif warning_msg:
+                    msg = warning_msg
+                    func.__doc__ = warning_msg
+                else:
+                    msg = "Call to deprecated function %s." % func.__name__
+                warnings.warn(msg, category=ObsPyDeprecationWarning,
+                              stacklevel=2)
+                emitted[0] = True
+            return func(*args, **kwargs)
+        return wrapper
     return _deprecated
 
 
@@ -63,15 +95,16 @@ def deprecated_keywords(keywords):
     :type keywords: dict
     :param keywords: old/new keyword names as key/value pairs.
     """
+    deprecated_set = frozenset(keywords)
+
     def fdec(func):
         fname = func.__name__
-        msg = "Deprecated keyword %s in %s() call - please use %s instead."
-        msg2 = "Deprecated keyword %s in %s() call - ignoring."
-        msg3 = ("Conflicting deprecated keywords (%s) in %s() call"
-                " - please use new '%s' keyword instead.")
 
         @functools.wraps(func)
         def echo_func(*args, **kwargs):
+            # fast path, usually no deprecated keywords are used at all
+            if deprecated_set.isdisjoint(kwargs):
+                return func(*args, **kwargs)
             # check if multiple deprecated keywords get mapped to the same new
             # keyword
             new_keyword_appearance_counts = dict.fromkeys(keywords.values(), 0)
@@ -87,19 +120,20 @@ def deprecated_keywords(keywords):
                     conflicting_keys = ", ".join(
                         [old_key for old_key, new_key in keywords.items()
                          if new_key == key_])
-                    raise Exception(msg3 % (conflicting_keys, fname, new_key))
+                    raise Exception(_MSG_CONFLICTING_KEYWORDS % (
+                        conflicting_keys, fname, new_key))
             # map deprecated keywords to new keywords
             for kw in list(kwargs):
                 if kw in keywords:
                     nkw = keywords[kw]
                     if nkw is None:
-                        warnings.warn(msg2 % (kw, fname),
+                        warnings.warn(_MSG_IGNORED_KEYWORD % (kw, fname),
                                       category=ObsPyDeprecationWarning,
                                       stacklevel=3)
                     else:
-                        warnings.warn(msg % (kw, fname, nkw),
-                                      category=ObsPyDeprecationWarning,
-                                      stacklevel=3)
+                        warnings.warn(
+                            _MSG_DEPRECATED_KEYWORD % (kw, fname, nkw),
+                            category=ObsPyDeprecationWarning, stacklevel=3)
                         kwargs[nkw] = kwargs[kw]
                     del kwargs[kw]
             return func(*args, **kwargs)
@@ -108,44 +142,121 @@ def deprecated_keywords(keywords):
     return fdec
 
 
-@decorator
-def skip_on_network_error(func, *args, **kwargs):
+def skip_on_network_error(func):
     """
     Decorator to mark test routines that fail with certain network
     errors (e.g. timeouts) as "skipped" rather than "Error".
     """
-    try:
-        return func(*args, **kwargs)
-    ###################################################
-    # add more except clauses like this to add other
-    # network errors that should be skipped
-    except socket.timeout as e:
-        if str(e) == "timed out":
-            pytest.skip(str(e))
-    ###################################################
-    except socket.error as e:
-        if str(e) == "[Errno 110] Connection timed out":
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        ###################################################
+        # add more except clauses like this to add other
+        # network errors that should be skipped
+        # (socket.timeout is an alias of TimeoutError on Python >= 3.10)
+        except (socket.timeout, TimeoutError) as e:
             pytest.skip(str(e))
-    # general except to be able to generally reraise
+        ###################################################
+        except OSError as e:
+            # e.g. OSError subclasses carrying ETIMEDOUT
+            if e.errno == errno.ETIMEDOUT:
+                pytest.skip(str(e))
+            raise
+    return wrapper
+
+
+def _discard_tempfile(tempfile):
+    """
+    Close and delete a temporary file.
+    """
+    tempfile.close()
+    Path(tempfile.name).unlink()
+
+
+def _copy_to_tempfile(fileobj):
+    """
+    Copy an open binary file-like object chunk-wise to a new temporary file.
+
+    The caller is responsible for closing the returned temporary file (e.g.
+    by using it in a ``with`` statement), which also deletes it.
+    """
+    tempfile = NamedTemporaryFile()
+    try:
+        shutil.copyfileobj(fileobj, tempfile._fileobj, _COPY_CHUNK_SIZE)
     except Exception:
+        _discard_tempfile(tempfile)
         raise
+    return tempfile
 
 
-@decorator
-def uncompress_file(func, filename, *args, **kwargs):
+def _is_tar_header(header):
     """
-    Decorator used for temporary uncompressing file if .gz or .bz2 archive.
+    Check if given leading bytes are the header block of a tar archive.
+    """
+    if len(header) < 512:
+        return False
+    # "ustar" magic of POSIX and GNU tar archives
+    if header[257:262] == b'ustar':
+        return True
+    # old V7 archives have no magic, validate header checksum instead
+    try:
+        chksum = int(header[148:156].split(b'\x00', 1)[0].strip(), 8)
+    except ValueError:
+        return False
+    return chksum in tarfile.calc_chksums(header)
+
+
+def _sniff_compression(filename):
+    """
+    Determine compression/archive type of a file from its leading bytes.
+
+    :rtype: str or None
+    :returns: One of ``'tar'``, ``'zip'``, ``'bz2'`` or ``'gz'``, ``None`` if
+        the file is neither compressed nor an archive.
+    """
+    with open(filename, 'rb') as fh:
+        header = fh.read(512)
+    if _is_tar_header(header):
+        return 'tar'
+    elif header[:4] in (b'PK\x03\x04', b'PK\x05\x06'):
+        return 'zip'
+    elif header[:2] == b'\x1f\x8b':
+        compression = 'gz'
+        module = 'gzip'
+    elif header[:3] == b'BZh':
+        compression = 'bz2'
+        module = 'bz2'
+    elif header[:6] == b'\xfd7zXZ\x00':
+        # only supported as compressed tar archive
+        compression = None
+        module = 'lzma'
+    else:
+        return None
+    # check for compressed tar archive
+    try:
+        with importlib.import_module(module).open(filename, 'rb') as fp:
+            if _is_tar_header(fp.read(512)):
+                return 'tar'
+    except Exception:
+        pass
+    return compression
+
+
+def _uncompress_to_tempfiles(filename, compression):
     """
-    if not kwargs.pop('check_compression', True):
-        return func(filename, *args, **kwargs)
-    if not isinstance(filename, str):
-        return func(filename, *args, **kwargs)
-    elif not Path(filename).exists():
-        msg = "File not found '%s'" % (filename)
-        raise IOError(msg)
-    # check if we got a compressed file or archive
-    obj_list = []
-    if tarfile.is_tarfile(filename):
+    Generator yielding temporary files holding the uncompressed content of
+    each member of a compressed file or archive.
+
+    Members are uncompressed one at a time, so memory usage does not scale
+    with archive size. Nothing is yielded if the file can not be
+    uncompressed.
+
+    :type compression: str
+    :param compression: Compression/archive type as determined by
+        :func:`_sniff_compression`.
+    """
+    if compression == 'tar':
         try:
             # reading with transparent compression
             with tarfile.open(filename, 'r|*') as tar:
@@ -153,94 +264,135 @@ def uncompress_file(func, filename, *args, **kwargs):
                     # only handle regular files
                     if not tarinfo.isfile():
                         continue
-                    data = tar.extractfile(tarinfo).read()
                     # Skip empty files - we don't need them no matter what
                     # and it guards against rare cases where waveforms files
                     # are also slightly valid tar-files.
-                    if not data:
+                    if not tarinfo.size:
                         continue
-                    obj_list.append(data)
+                    yield _copy_to_tempfile(tar.extractfile(tarinfo))
         except Exception:
             pass
-    elif zipfile.is_zipfile(filename):
+    elif compression == 'zip':
         try:
             with zipfile.ZipFile(filename) as zip:
+                # be nice to plugins based on zip format
+                # do not uncompress the file if tag is present
+                # see issue #3192
                 if b'obspy_no_uncompress' in zip.comment:
-                    # be nice to plugins based on zip format
-                    # do not uncompress the file if tag is present
-                    # see issue #3192
-                    obj_list = None
-                else:
-                    obj_list = [zip.read(name) for name in zip.namelist()]
+                    return
+                for name in zip.namelist():
+                    with zip.open(name) as fp:
+                        yield _copy_to_tempfile(fp)
         except Exception:
             pass
-    elif filename.endswith('.bz2'):
+    elif compression == 'bz2':
         # bz2 module
         try:
             import bz2
-            with open(filename, 'rb') as fp:
-                obj_list.append(bz2.decompress(fp.read()))
+            with bz2.open(filename, 'rb') as fp:
+                yield _copy_to_tempfile(fp)
         except Exception:
             pass
-    elif filename.endswith('.gz'):
+    elif compression == 'gz':
         # gzip module
         try:
             import gzip
             with gzip.open(filename, 'rb') as fp:
-                obj_list.append(fp.read())
+                yield _copy_to_tempfile(fp)
         except Exception:
             pass
-    # handle results
-    if obj_list:
-        # write results to temporary files
+
+
+def uncompress_file(func):
+    """
+    Decorator used for temporary uncompressing file if .gz or .bz2 archive.
+    """
+    @functools.wraps(func)
+    def wrapper(filename, *args, **kwargs):
+        if not kwargs.pop('check_compression', True):
+            return func(filename, *args, **kwargs)
+        if not isinstance(filename, str):
+            return func(filename, *args, **kwargs)
+        # check if we got a compressed file or archive
+        try:
+            compression = _sniff_compression(filename)
+        except FileNotFoundError:
+            msg = "File not found '%s'" % (filename)
+            raise IOError(msg) from None
+        if compression is None:
+            # no compressions
+            return func(filename, *args, **kwargs)
+        members = _uncompress_to_tempfiles(filename, compression)
+        tempfile = next(members, None)
+        if tempfile is None:
+            # could not be uncompressed
+            return func(filename, *args, **kwargs)
+        # uncompress the next member in a background thread while the
+        # current one gets parsed, parsing itself stays in this thread as
+        # not all plugins are thread-safe
         result = None
-        for obj in obj_list:
-            with NamedTemporaryFile() as tempfile:
-                tempfile._fileobj.write(obj)
-                stream = func(tempfile.name, *args, **kwargs)
-                # just add other stream objects to first stream
-                if result is None:
-                    result = stream
-                else:
-                    result += stream
-    else:
-        # no compressions
-        result = func(filename, *args, **kwargs)
-    return result
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while tempfile is not None:
+                    future = executor.submit(next, members, None)
+                    try:
+                        with tempfile:
+                            stream = func(tempfile.name, *args, **kwargs)
+                    finally:
+                        tempfile = future.result()
+                    # just add other stream objects to first stream
+                    if result is None:
+                        result = stream
+                    else:
+                        result += stream
+        finally:
+            # clean up if parsing failed
+            if tempfile is not None:
+                _discard_tempfile(tempfile)
+            members.close()
+        return result
+    return wrapper
 
 
-@decorator
-def raise_if_masked(func, *args, **kwargs):
+def raise_if_masked(func):
     """
     Raises if the first argument (self in case of methods) is a Trace with
     masked values or a Stream containing a Trace with masked values.
     """
-    arrays = []
-    # first arg seems to be a Stream
-    if hasattr(args[0], "traces"):
-        arrays = [tr.data for tr in args[0]]
-    # first arg seems to be a Trace
-    if hasattr(args[0], "data") and isinstance(args[0].data, np.ndarray):
-        arrays = [args[0].data]
-    for arr in arrays:
-        if np.ma.is_masked(arr):
-            msg = "Trace with masked values found. This is not " + \
-                  "supported for this operation. Try the split() " + \
-                  "method on Trace/Stream to produce a Stream with " + \
-                  "unmasked Traces."
-            raise NotImplementedError(msg)
-    return func(*args, **kwargs)
-
-
-@decorator
-def skip_if_no_data(func, *args, **kwargs):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arrays = []
+        # first arg seems to be a Stream
+        if hasattr(args[0], "traces"):
+            arrays = [tr.data for tr in args[0]]
+        # first arg seems to be a Trace
+        elif hasattr(args[0], "data") and \
+                isinstance(args[0].data, np.ndarray):
+            arrays = [args[0].data]
+        for arr in arrays:
+            # plain ndarrays can not have masked values, avoid the more
+            # expensive np.ma.is_masked() check for them
+            if isinstance(arr, np.ma.MaskedArray) and np.ma.is_masked(arr):
+                msg = "Trace with masked values found. This is not " + \
+                      "supported for this operation. Try the split() " + \
+                      "method on Trace/Stream to produce a Stream with " + \
+                      "unmasked Traces."
+                raise NotImplementedError(msg)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def skip_if_no_data(func):
     """
     Does nothing if the first argument (self in case of methods) is a Trace
     with no data in it.
     """
-    if not args[0]:
-        return
-    return func(*args, **kwargs)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not args[0]:
+            return
+        return func(*args, **kwargs)
+    return wrapper
 
 
 def map_example_filename(arg_kwarg_name):
@@ -257,44 +409,36 @@ def map_example_filename(arg_kwarg_name):
     :type arg_kwarg_name: str
     :param arg_kwarg_name: name of the arg/kwarg that should be (tried) to map
     """
-    @decorator
-    def _map_example_filename(func, *args, **kwargs):
-        prefix = '/path/to/'
-        # check kwargs
-        if arg_kwarg_name in kwargs:
-            if isinstance(kwargs[arg_kwarg_name], str):
-                if re.match(prefix, kwargs[arg_kwarg_name]):
-                    try:
-                        kwargs[arg_kwarg_name] = \
-                            get_example_file(kwargs[arg_kwarg_name][9:])
-                    # file not found by get_example_file:
-                    except IOError:
-                        pass
-        # check args
-        else:
-            try:
-                inspected_args = [
-                    p.name
-                    for p in inspect.signature(func).parameters.values()
-                ]
-            except AttributeError:
-                inspected_args = inspect.getargspec(func).args
-            try:
-                ind = inspected_args.index(arg_kwarg_name)
-            except ValueError:
-                pass
-            else:
-                if ind < len(args) and isinstance(args[ind], str):
-                    # need to check length of args from inspect
-                    if re.match(prefix, args[ind]):
+    def _map_example_filename(func):
+        # look up position of arg/kwarg in signature once at decoration time
+        params = [p.name for p in inspect.signature(func).parameters.values()]
+        ind = params.index(arg_kwarg_name) if arg_kwarg_name in params else -1
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            prefix = '/path/to/'
+            # check kwargs
+            if arg_kwarg_name in kwargs:
+                if isinstance(kwargs[arg_kwarg_name], str):
+                    if kwargs[arg_kwarg_name].startswith(prefix):
                         try:
-                            args = list(args)
-                            args[ind] = get_example_file(args[ind][9:])
-                            args = tuple(args)
+                            kwargs[arg_kwarg_name] = _cached_example_file(
+                                kwargs[arg_kwarg_name][9:])
                         # file not found by get_example_file:
                         except IOError:
                             pass
-        return func(*args, **kwargs)
+            # check args
+            elif 0 <= ind < len(args) and isinstance(args[ind], str):
+                if args[ind].startswith(prefix):
+                    try:
+                        args = list(args)
+                        args[ind] = _cached_example_file(args[ind][9:])
+                        args = tuple(args)
+                    # file not found by get_example_file:
+                    except IOError:
+                        pass
+            return func(*args, **kwargs)
+        return wrapper
     return _map_example_filename
 
 
@@ -13,6 +13,10 @@ See the module :mod:`obspy.io.json.default` for documentation on the class.
 A write function for files and a utility for compact string serialization using
 the Default class are located in :mod:`obspy.io.json.core`.
 
+For fast serialization of large catalogs use :func:`obspy.io.json.dumps`,
+which uses the :mod:`orjson` module if it is installed and falls back to
+the standard library :py:mod:`json` module otherwise.
+
 """
 from .default import Default
-from .core import get_dump_kwargs, _write_json
+from .core import dumps, get_dump_kwargs, _write_json
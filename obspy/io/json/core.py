@@ -3,6 +3,36 @@ import json
 
 from .default import Default
 
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+
+def dumps(obj, default=None):
+    """
+    Serialize object to a compact JSON string.
+
+    Uses :mod:`orjson` if it is installed (which is considerably faster for
+    large :class:`~obspy.core.event.Catalog` objects and serializes numpy
+    arrays natively) and falls back to the standard library :py:mod:`json`
+    module otherwise.
+
+    :param obj: The object to serialize, e.g. an ObsPy Event-type object.
+    :type default: :class:`~obspy.io.json.default.Default`
+    :param default: "default" function for objects that can not be
+        serialized natively. Defaults to ``Default(omit_nulls=True)``.
+    :rtype: str
+    """
+    if default is None:
+        default = Default()
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(obj, default=default, separators=(',', ':'))
+
 
 def get_dump_kwargs(minify=True, no_nulls=True, **kwargs):
     """
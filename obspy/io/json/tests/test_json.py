@@ -4,8 +4,9 @@ import json
 
 import pytest
 
+from obspy import UTCDateTime
 from obspy.io.json.default import Default
-from obspy.io.json.core import get_dump_kwargs, _write_json
+from obspy.io.json.core import dumps, get_dump_kwargs, _write_json
 from obspy.io.quakeml.core import _read_quakeml
 
 
@@ -35,6 +36,18 @@ class TestJSON():
         s = json.dumps(self.event, default=default)
         self.verify_json(s)
 
+    def test_default_utcdatetime(self):
+        """Test UTCDateTime serialization matches str()"""
+        default = Default()
+        times = [UTCDateTime(2008, 10, 1, 12, 30, 35, 45020),
+                 UTCDateTime(0), UTCDateTime(-1.9999995),
+                 UTCDateTime(ns=1234567890123456789),
+                 UTCDateTime(1.23456789, precision=3)]
+        for t in times:
+            assert default(t) == str(t)
+        default = Default(time_format="%Y-%m-%d")
+        assert default(times[0]) == "2008-10-01"
+
     def test_get_dump_kwargs(self):
         """Test getting kwargs for json.dumps"""
         kw = get_dump_kwargs()
@@ -55,6 +68,22 @@ class TestJSON():
         # Compacted version is smaller
         assert len(s1) < len(s2)
 
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_dumps(self, monkeypatch, use_orjson):
+        """Test compact serialization helper with both backends"""
+        if use_orjson:
+            pytest.importorskip('orjson')
+        monkeypatch.setattr('obspy.io.json.core.HAS_ORJSON', use_orjson)
+        s = dumps(self.c)
+        self.verify_json(s)
+        # should match stdlib serialization with same settings
+        kw = get_dump_kwargs()
+        assert json.loads(s) == json.loads(json.dumps(self.c, **kw))
+        s = dumps(self.event, default=Default(omit_nulls=False))
+        self.verify_json(s)
+        kw = get_dump_kwargs(no_nulls=False)
+        assert json.loads(s) == json.loads(json.dumps(self.event, **kw))
+
     def test_write_json(self):
         memfile = io.StringIO()
         _write_json(self.c, memfile)
@@ -106,6 +106,7 @@ EXTRAS_REQUIRES = {
     ],
     'geo': ['geographiclib'],
     'imaging': ['cartopy'],
+    'io.json': ['orjson'],
     'io.shapefile': ['pyshp'],
 }
 EXTRAS_REQUIRES['all'] = [dep for depl in EXTRAS_REQUIRES.values()